@@ -0,0 +1,179 @@
+import streamlit as st
+import httpx
+from lxml import etree
+import codecs
+import threading
+import re
+from functools import lru_cache, partial
+from itertools import islice
+from urllib.parse import urlsplit
+
+
+# ---------------------------
+# API Key Loader
+# ---------------------------
+def read_api_key():
+    try:
+        return st.secrets["genai"]["api_key"], None
+    except Exception:
+        return None, "API key missing in `.streamlit/secrets.toml`."
+
+
+# ---------------------------
+# Pooled HTTP Client
+# ---------------------------
+# Article bodies sit well inside this; anything past it is ads, comments and scripts
+MAX_BODY_BYTES = 512 * 1024
+
+
+@st.cache_resource
+def get_http_client():
+    # Held across reruns so keep-alive (HTTP/2 where the CDN offers it) connections to news hosts are reused
+    transport = httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    )
+    return httpx.Client(
+        transport=transport,
+        follow_redirects=True,
+        headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+        timeout=httpx.Timeout(10.0, connect=3.05),
+    )
+
+
+@lru_cache(maxsize=64)
+def parser_encoding(label):
+    # Content-Type charset labels that Python or lxml don't know (x-sjis, utf-8mb4, unicode)
+    # would make the parser raise LookupError and fail the fetch; return None instead so
+    # lxml sniffs <meta charset> from the bytes
+    if not label:
+        return None
+    try:
+        codecs.lookup(label)
+        etree.HTMLParser(encoding=label)
+    except LookupError:
+        return None
+    return label
+
+
+# ---------------------------
+# Bounded Word Counter
+# ---------------------------
+_WORD_RE = re.compile(r"\S+")
+
+
+def has_min_words(text, n):
+    # Stops scanning after n words instead of splitting the whole article into a list
+    return sum(1 for _ in islice(_WORD_RE.finditer(text), n)) >= n
+
+
+# ---------------------------
+# Host Lookup
+# ---------------------------
+def url_host(url):
+    # Lower-cased hostname, accepting bare "site.com/path" input. Malformed input such as an
+    # unclosed IPv6 bracket makes urlsplit raise; that is treated as no host, since callers
+    # run this on every keystroke and batch line.
+    url = url or ""
+    try:
+        return urlsplit(url if "//" in url else "//" + url).hostname or ""
+    except ValueError:
+        return ""
+
+
+def lookup_by_host(url, table):
+    # Strips subdomain labels (www., en., bangla.) until the host hits a key of table
+    host = url_host(url)
+    while host:
+        if host in table:
+            return table[host]
+        host = host.partition(".")[2]
+    return None
+
+
+# ---------------------------
+# Paragraph Queries
+# ---------------------------
+def class_paragraph_xpath(class_strings):
+    # One compiled query walks the tree once for all classes: every <p> under an element
+    # carrying all tokens of any class string, each returned once in document order.
+    # Tokens are bound as XPath variables, so user-typed classes with quotes stay valid.
+    tokens = {}
+    conditions = []
+    for cls in class_strings:
+        names = []
+        for token in cls.split():
+            name = f"t{len(tokens)}"
+            tokens[name] = f" {token} "
+            names.append(f"contains(concat(' ', normalize-space(@class), ' '), ${name})")
+        conditions.append("(" + " and ".join(names) + ")")
+    return partial(etree.XPath(f"//*[{' or '.join(conditions)}]//p"), **tokens)
+
+
+# Built once per process here rather than in the entry script, which reruns on every interaction
+SOURCE_PARAGRAPH_QUERIES = {
+    host: class_paragraph_xpath(classes)
+    for host, classes in {
+        "prothomalo.com": ["story-element-text"],
+        "thedailystar.net": ["pb-20", "clearfix"],
+        "dw.com": ["rich-text"],
+        "tbsnews.net": ["section-content"],
+        "mzamin.com": ["lh-base"]
+    }.items()
+}
+
+
+# ---------------------------
+# Gemini Client Handle
+# ---------------------------
+@st.cache_resource
+def get_client(api_key):
+    # One client per key, reused across reruns, sessions and batch workers. The client carries
+    # its own key, so no process-global genai.configure() state is mutated; the SDK is imported
+    # on first use so a page load doesn't pay for it before anyone asks for a summary.
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+
+# ---------------------------
+# Language Identification
+# ---------------------------
+@st.cache_resource
+def get_language_identifier():
+    # CLD3 scores character n-grams in C++; the lock serializes access to the shared
+    # identifier from concurrent sessions and batch workers
+    import gcld3
+    return gcld3.NNetLanguageIdentifier(min_num_bytes=0, max_num_bytes=2000), threading.Lock()
+
+
+def identify_language(text):
+    identifier, lock = get_language_identifier()
+    with lock:
+        result = identifier.FindLanguage(text=text[:2000])
+    # Short or mixed snippets come back as a guess (e.g. a headline read as Malay); treat
+    # those like "und" and fall back to English
+    return result.language if result.is_reliable and result.language != "und" else "en"
+
+
+# ---------------------------
+# Prompt Length Cap
+# ---------------------------
+# Articles past this many characters add prompt tokens (cost and prefill latency)
+# without improving a headline plus short summary
+MAX_PROMPT_CHARS = 6000
+
+
+# Latin and Bangla (danda) sentence ends, CJK full-width ones, and the newline that joins paragraphs
+_SENTENCE_ENDS = ".!?।。！？\n"
+
+
+def truncate_to_sentence(text, limit):
+    # Cut at the last sentence end inside the limit, but only in its second half: an early
+    # match ("Dr." or "2.5" in an otherwise unpunctuated article) would leave almost nothing,
+    # so fall back to a hard cut at the limit
+    if len(text) <= limit:
+        return text
+    head = text[:limit]
+    cut = max(head.rfind(mark) for mark in _SENTENCE_ENDS)
+    return head[:cut + 1].rstrip() if cut >= limit // 2 else head
@@ -1,40 +1,122 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-import google.generativeai as genai
-import langdetect
-from functools import lru_cache
+from lxml import etree
+from google.genai import types
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import diskcache
 import re
+import orjson
+from types import MappingProxyType
+from core import (
+    MAX_BODY_BYTES,
+    MAX_PROMPT_CHARS,
+    get_client,
+    get_http_client,
+    has_min_words,
+    identify_language,
+    lookup_by_host,
+    parser_encoding,
+    read_api_key,
+    truncate_to_sentence,
+    url_host,
+)
 
 
 # ---------------------------
-# API Key Loader
+# Known Source Content Classes
 # ---------------------------
-def read_api_key():
-    try:
-        return st.secrets["genai"]["api_key"], None
-    except KeyError:
-        return None, "API key missing in `.streamlit/secrets.toml`."
+# Class strings are pre-split into token sets once at import, not on every rerun; a div
+# is a target when its class tokens include every token of any one set
+_TARGET_CLASSES = MappingProxyType({
+    source: tuple(frozenset(cls.split()) for cls in classes)
+    for source, classes in {
+        "Daily Prothom Alo": ["story-element story-element-text"],
+        "The Daily Star": ["pb-20 clearfix"],
+        "DW": ["c17j8gzx rc0m0op r1ebneao s198y7xq rich-text li5mn0y r16w0xvi w1fzgn0z blt0baw"],
+        "The Business Standard": ["section-content clearfix margin-bottom-2", "section-content margin-bottom-2"],
+        "Daily Manab Zamin": ["col-sm-10 offset-sm-1 fs-5 lh-base mt-4 mb-5"],
+    }.items()
+})
+
+# Article language is known up front only on each source's main edition host; language
+# subdomains (en.prothomalo.com, bangla.thedailystar.net) and DW, which publishes in dozens
+# of languages, are detected like any other page
+_HOST_LANG = MappingProxyType({
+    host: lang
+    for domain, lang in {
+        "prothomalo.com": "bn",
+        "mzamin.com": "bn",
+        "thedailystar.net": "en",
+        "tbsnews.net": "en",
+    }.items()
+    for host in (domain, "www." + domain)
+})
+
+
+def source_language(url):
+    return _HOST_LANG.get(url_host(url))
 
 
 # ---------------------------
 # URL Extractor
 # ---------------------------
+def _is_target_div(element, target_classes):
+    if element.tag != "div":
+        return False
+    tokens = set((element.get("class") or "").split())
+    return any(class_set <= tokens for class_set in target_classes)
+
+
+def _read_target_paragraphs(response, target_classes):
+    # Feed the body to lxml's pull parser as it downloads, collecting paragraphs inside
+    # target divs, and stop reading at MAX_BODY_BYTES. Target divs can appear anywhere
+    # before that, so the page is not cut short at the first one's enclosing element.
+    # Decode with the charset from the Content-Type header when there is one; otherwise
+    # lxml sniffs <meta charset> from the bytes (no Python-side charset detection either way)
+    parser = etree.HTMLPullParser(events=("start", "end"), encoding=parser_encoding(response.charset_encoding))
+    paragraphs = []
+    open_targets = 0
+
+    def consume_events():
+        nonlocal open_targets
+        for event, element in parser.read_events():
+            if event == "start":
+                if _is_target_div(element, target_classes):
+                    open_targets += 1
+            elif element.tag == "p" and open_targets:
+                paragraphs.append("".join(part.strip() for part in element.itertext()))
+            elif _is_target_div(element, target_classes):
+                open_targets -= 1
+
+    received = 0
+    for chunk in response.iter_bytes(chunk_size=16384):
+        parser.feed(chunk)
+        consume_events()
+        received += len(chunk)
+        if received >= MAX_BODY_BYTES:
+            break
+    parser.close()
+    consume_events()
+    return paragraphs
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _fetch_article_text(url, target_classes):
+    # Memoized on (url, target_classes) so Regenerate only re-calls Gemini; failed
+    # fetches raise instead of returning, so they are never cached
+    with get_http_client().stream("GET", url) as response:
+        response.raise_for_status()
+        return "\n".join(_read_target_paragraphs(response, target_classes))
+
+
 def extract_content_from_url(url, target_classes):
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        paragraphs = []
-        for target_class in target_classes:
-            paragraphs.extend(
-                p.get_text(strip=True)
-                for div in soup.find_all('div', class_=target_class)
-                for p in div.find_all('p')
-            )
-        combined = "\n".join(paragraphs)
-        if not combined or len(combined.split()) < 50:
+        combined = _fetch_article_text(url, target_classes)
+        if not has_min_words(combined, 50):
             return None, "❌ Content too short or invalid."
         return combined, None
     except Exception as e:
@@ -42,34 +124,366 @@ def extract_content_from_url(url, target_classes):
 
 
 # ---------------------------
-# Summarizer
+# Gemini Model Settings
+# ---------------------------
+MODEL_NAME = "gemini-2.0-flash"
+GENERATION_CONFIG = types.GenerateContentConfig(temperature=0.4, top_p=0.9, max_output_tokens=1024)
+
+
 # ---------------------------
-@lru_cache(maxsize=10)
-def summarize_content(content, api_key, min_limit, max_limit):
+# Semantic Summary Cache
+# ---------------------------
+class _EmbeddingRows:
+    """Growable row arrays for one SemanticCache group; capacity doubles, so appends are amortized O(1)."""
+
+    def __init__(self, dim, capacity=64):
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+        self.limits = np.empty((capacity, 2))
+        self.expires = np.empty(capacity)
+        self.summaries = []
+        self.entry_ids = []
+
+    def __len__(self):
+        return len(self.summaries)
+
+    def append(self, embedding, limits, expire_time, summary, entry_id):
+        n = len(self)
+        if n == len(self.expires):
+            grow = max(n, 64)
+            self.vectors = np.concatenate([self.vectors, np.empty((grow, self.vectors.shape[1]), dtype=np.float32)])
+            self.limits = np.concatenate([self.limits, np.empty((grow, 2))])
+            self.expires = np.concatenate([self.expires, np.empty(grow)])
+        self.vectors[n], self.limits[n], self.expires[n] = embedding, limits, expire_time
+        self.summaries.append(summary)
+        self.entry_ids.append(entry_id)
+
+    def live(self):
+        n = len(self)
+        return self.vectors[:n], self.limits[:n], self.expires[:n]
+
+    def keep(self, mask):
+        # Returns the entry ids of the dropped rows
+        vectors, limits, expires = self.live()
+        dropped = [entry_id for entry_id, kept in zip(self.entry_ids, mask) if not kept]
+        self.vectors, self.limits, self.expires = vectors[mask], limits[mask], expires[mask]
+        self.summaries = [summary for summary, kept in zip(self.summaries, mask) if kept]
+        self.entry_ids = [entry_id for entry_id, kept in zip(self.entry_ids, mask) if kept]
+        return dropped
+
+
+class SemanticCache:
+    """Serves a stored summary when a new article embeds close enough to a previous one.
+
+    Entries are persisted with diskcache so the index survives app restarts; the
+    in-memory matrices are rebuilt from disk on startup. Keys are (min_limit, max_limit,
+    *rest): entries only match on an equal rest (language, model, prompt cap), and a
+    stored summary is reused for word limits within limit_tolerance of its own. Entries
+    expire on the same schedule as SummaryCache, so neither layer outlives the other;
+    past max_entries, expired and then oldest entries are evicted.
+    """
+
+    def __init__(self, directory=".semantic_cache", threshold=0.92, limit_tolerance=10,
+                 expire=7 * 86400, max_entries=10000):
+        self.threshold = threshold
+        self.limit_tolerance = limit_tolerance
+        self.expire = expire
+        self.max_entries = max_entries
+        self._store = diskcache.Cache(directory)
+        self._entries = {}  # rest of key -> _EmbeddingRows
+        self._lock = threading.Lock()
+        for entry_id in list(self._store):
+            record, expire_time = self._store.get(entry_id, expire_time=True)
+            if record is None:
+                continue
+            if expire_time is None:
+                # Written before entries carried an expiry; its age is unknown
+                self._store.delete(entry_id)
+                continue
+            key, embedding, summary = record
+            self._append(embedding, key, summary, expire_time, entry_id)
+        if len(self) > self.max_entries:
+            self._evict()
+
+    def __len__(self):
+        return sum(len(rows) for rows in self._entries.values())
+
+    def lookup(self, embedding, key):
+        min_limit, max_limit, *rest = key
+        with self._lock:
+            rows = self._entries.get(tuple(rest))
+            if not rows:
+                return None
+            vectors, limits, expires = rows.live()
+            scores = vectors @ embedding
+            close = np.abs(limits - (min_limit, max_limit)).max(axis=1) <= self.limit_tolerance
+            scores[~close | (expires <= time.time())] = -1.0
+            best = int(np.argmax(scores))
+            return rows.summaries[best] if scores[best] >= self.threshold else None
+
+    def add(self, embedding, key, summary, entry_id):
+        # Re-adding an entry_id replaces its row, so a regenerated summary supersedes the old one
+        with self._lock:
+            self._discard(key, entry_id)
+            self._append(embedding, key, summary, time.time() + self.expire, entry_id)
+            if len(self) > self.max_entries:
+                self._evict()
+        self._store.set(entry_id, (key, embedding, summary), expire=self.expire)
+
+    def _append(self, embedding, key, summary, expire_time, entry_id):
+        min_limit, max_limit, *rest = key
+        rows = self._entries.get(tuple(rest))
+        if rows is None:
+            rows = self._entries[tuple(rest)] = _EmbeddingRows(len(embedding))
+        rows.append(embedding, (min_limit, max_limit), expire_time, summary, entry_id)
+
+    def _discard(self, key, entry_id):
+        rows = self._entries.get(tuple(key[2:]))
+        if rows and entry_id in rows.entry_ids:
+            rows.keep(np.array([existing != entry_id for existing in rows.entry_ids]))
+
+    def _evict(self):
+        # Drop expired rows, then the oldest (earliest expiry) down to 90% of max_entries,
+        # so a full cache doesn't compact on every add
+        now = time.time()
+        live_expires = np.concatenate([rows.live()[2] for rows in self._entries.values()])
+        live_expires = np.sort(live_expires[live_expires > now])
+        target = int(self.max_entries * 0.9)
+        cutoff = live_expires[-target] if 0 < target < len(live_expires) else now
+        for rest, rows in list(self._entries.items()):
+            expires = rows.live()[2]
+            for entry_id in rows.keep((expires > now) & (expires >= cutoff)):
+                self._store.delete(entry_id)
+            if not rows:
+                del self._entries[rest]
+
+
+@st.cache_resource
+def get_semantic_cache():
+    return SemanticCache()
+
+
+def embed_content(content, api_key):
     try:
-        lang = langdetect.detect(content)
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(
-            model_name="gemini-2.0-flash",
-            generation_config={"temperature": 0.4, "top_p": 0.9, "max_output_tokens": 1024},
-        )
-        chat = model.start_chat()
+        result = get_client(api_key).models.embed_content(model="text-embedding-004", contents=content[:8000])
+        vector = np.asarray(result.embeddings[0].values, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    except Exception:
+        return None
+
+
+# ---------------------------
+# Language Detection
+# ---------------------------
+def guess_language(content):
+    # A Bangla-dominated sample is settled by Unicode range alone, and short pure-ASCII
+    # text is taken as English; only otherwise run CLD3 on a head slice
+    sample = content[:2048]
+    if content.isascii() and len(content) < 5000:
+        return "en"
+    bangla = sum(1 for ch in sample if "\u0980" <= ch <= "\u09ff")
+    latin = sum(1 for ch in sample if ch.isascii() and ch.isalpha())
+    if bangla and bangla >= 4 * latin:
+        return "bn"
+    return identify_language(content)
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def detect_language(content_hash, _content):
+    # Memoized per content hash, so re-summarizing the same article at new word limits skips detection
+    return guess_language(_content)
 
-        prompt = (
-            f"You are a journalist summarizing content in {lang}. "
-            f"Generate a headline and a summary within {min_limit} to {max_limit} words, "
-            "preserving the language and tone.\n\n"
-            f"Content:\n{content}"
-        )
 
-        response = chat.send_message(prompt)
-        if response and response.text:
-            return response.text.strip(), None
+# ---------------------------
+# Exact Summary Cache
+# ---------------------------
+class SummaryCache:
+    """Bounded LRU of finished summaries in front of a disk store that survives app restarts."""
+
+    def __init__(self, directory=".summary_cache", maxsize=256, expire=7 * 86400):
+        self.maxsize = maxsize
+        self.expire = expire
+        self._store = diskcache.Cache(directory)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._entries.move_to_end(key)
+                return summary
+        summary = self._store.get(key)
+        if summary is not None:
+            with self._lock:
+                self._remember(key, summary)
+        return summary
+
+    def set(self, key, summary):
+        with self._lock:
+            self._remember(key, summary)
+        self._store.set(key, summary, expire=self.expire)
+
+    def _remember(self, key, summary):
+        self._entries[key] = summary
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+@st.cache_resource
+def get_summary_cache():
+    return SummaryCache()
+
+
+# ---------------------------
+# Summarizer
+# ---------------------------
+# Fixed wording leads every prompt and the per-request values follow it, so the
+# prefix Gemini sees is byte-identical across calls and eligible for prefix caching
+_SUMMARY_INSTRUCTION = (
+    "You are a journalist summarizing the content below. "
+    "Generate a headline and a summary, preserving the language and tone."
+)
+
+
+def _summary_keys(content, min_limit, max_limit, lang):
+    normalized = re.sub(r"\s+", " ", content).strip()
+    content_hash = hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+    return content_hash, (MODEL_NAME, MAX_PROMPT_CHARS, content_hash, min_limit, max_limit, lang)
+
+
+def stream_summary(content, api_key, min_limit, max_limit, lang=None, refresh=False):
+    # Yields text as Gemini produces it; cache hits yield the stored summary in one piece.
+    # The API key never enters either cache key; the model name and prompt cap enter both, so
+    # changing either doesn't serve summaries persisted under the old settings.
+    # refresh skips both lookups and overwrites what is stored (used by Regenerate).
+    content_hash, exact_key = _summary_keys(content, min_limit, max_limit, lang)
+    summary_cache = get_summary_cache()
+    cached = None if refresh else summary_cache.get(exact_key)
+    if cached:
+        yield cached
+        return
+
+    lang = lang or detect_language(content_hash, content)
+    semantic_key = (min_limit, max_limit, lang, MODEL_NAME, MAX_PROMPT_CHARS)
+    semantic_cache = get_semantic_cache()
+    embedding = embed_content(content, api_key)
+    if embedding is not None and not refresh:
+        cached = semantic_cache.lookup(embedding, semantic_key)
+        if cached:
+            summary_cache.set(exact_key, cached)
+            yield cached
+            return
+
+    client = get_client(api_key)
+
+    prompt = (
+        f"{_SUMMARY_INSTRUCTION}\n"
+        f"Language: {lang}. Length: {min_limit} to {max_limit} words.\n\n"
+        f"Content:\n{truncate_to_sentence(content, MAX_PROMPT_CHARS)}"
+    )
+
+    chunks = []
+    for chunk in client.models.generate_content_stream(model=MODEL_NAME, contents=prompt, config=GENERATION_CONFIG):
+        if chunk.text:
+            chunks.append(chunk.text)
+            yield chunk.text
+
+    summary = "".join(chunks).strip()
+    if summary:
+        summary_cache.set(exact_key, summary)
+        if embedding is not None:
+            semantic_cache.add(embedding, semantic_key, summary, exact_key)
+
+
+def summarize_content(content, api_key, min_limit, max_limit, lang=None, stream_to=None, refresh=False):
+    # Pass a Streamlit container as stream_to to paint tokens as they arrive
+    try:
+        chunks = stream_summary(content, api_key, min_limit, max_limit, lang, refresh)
+        summary = stream_to.write_stream(chunks) if stream_to else "".join(chunks)
+        if summary and summary.strip():
+            return summary.strip(), None
         return None, "❌ No response generated."
     except Exception as e:
         return None, f"Error summarizing: {e}"
 
 
+# ---------------------------
+# Multi-article Summarizer
+# ---------------------------
+# Several articles share one prompt, and so one round-trip and one request against the quota;
+# the schema makes Gemini answer with exactly one {headline, summary} object per article
+ARTICLES_PER_CALL = 4
+BATCH_GENERATION_CONFIG = types.GenerateContentConfig(
+    temperature=0.4,
+    top_p=0.9,
+    max_output_tokens=1024 * ARTICLES_PER_CALL,
+    response_mime_type="application/json",
+    response_schema=types.Schema(
+        type=types.Type.ARRAY,
+        items=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "headline": types.Schema(type=types.Type.STRING),
+                "summary": types.Schema(type=types.Type.STRING),
+            },
+            required=["headline", "summary"],
+        ),
+    ),
+)
+
+
+def _summarize_group(group, api_key, min_limit, max_limit):
+    # group holds (content, lang) pairs; returns one summary per pair, in order
+    articles = "\n\n".join(
+        f"<<ARTICLE {i}>> Language: {lang or 'same as the article'}.\n{truncate_to_sentence(content, MAX_PROMPT_CHARS)}"
+        for i, (content, lang) in enumerate(group, 1)
+    )
+    prompt = (
+        f"{_SUMMARY_INSTRUCTION}\n"
+        f"Return a JSON array with one object per article, in article order. "
+        f"Length: {min_limit} to {max_limit} words each.\n\n{articles}"
+    )
+    response = get_client(api_key).models.generate_content(model=MODEL_NAME, contents=prompt, config=BATCH_GENERATION_CONFIG)
+    items = orjson.loads(response.text)
+    if len(items) != len(group):
+        raise ValueError(f"expected {len(group)} summaries, got {len(items)}")
+    return [f"{item['headline'].strip()}\n\n{item['summary'].strip()}" for item in items]
+
+
+def summarize_batch(contents, api_key, min_limit, max_limit, langs=None, max_workers=4):
+    # Exact-cache hits are served per article; only the misses are packed into prompts.
+    # Returns (summary, error) tuples in input order.
+    langs = langs or [None] * len(contents)
+    summary_cache = get_summary_cache()
+    keys = [_summary_keys(content, min_limit, max_limit, lang)[1] for content, lang in zip(contents, langs)]
+    results = [None] * len(contents)
+    misses = []
+    for i, key in enumerate(keys):
+        cached = summary_cache.get(key)
+        if cached:
+            results[i] = (cached, None)
+        else:
+            misses.append(i)
+
+    def run(group):
+        try:
+            summaries = _summarize_group([(contents[i], langs[i]) for i in group], api_key, min_limit, max_limit)
+        except Exception as e:
+            return [(None, f"Error summarizing: {e}")] * len(group)
+        for i, summary in zip(group, summaries):
+            summary_cache.set(keys[i], summary)
+        return [(summary, None) for summary in summaries]
+
+    groups = [misses[i:i + ARTICLES_PER_CALL] for i in range(0, len(misses), ARTICLES_PER_CALL)]
+    get_client(api_key)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for group, group_results in zip(groups, executor.map(run, groups)):
+            for i, result in zip(group, group_results):
+                results[i] = result
+    return results
+
+
 # ---------------------------
 # Reset Only Output (Not Input)
 # ---------------------------
@@ -83,21 +497,75 @@ def reset_output(page_type):
     st.rerun()
 
 
+# ---------------------------
+# Summary Output Block
+# ---------------------------
+def _render_summary_ui(page_type, summary):
+    # Drawn in the same run that produced the summary, so no st.rerun() round-trip is needed;
+    # the returned slot lets Regenerate swap the text in place
+    st.subheader("📑 Summary & Headline")
+    summary_slot = st.empty()
+    summary_slot.success(summary)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        regenerate = st.button("♻️ Regenerate Summary", use_container_width=True)
+    with col2:
+        if st.button("🏠 Home", use_container_width=True):
+            reset_output(page_type)
+    return summary_slot, regenerate
+
+
 # ---------------------------
 # Helper: Detect Source from URL
 # ---------------------------
+# Keyed by registrable domain; subdomains (www., en., bangla.) resolve by stripping labels
+_HOST_TO_SOURCE = MappingProxyType({
+    "prothomalo.com": "Daily Prothom Alo",
+    "thedailystar.net": "The Daily Star",
+    "dw.com": "DW",
+    "tbsnews.net": "The Business Standard",
+    "mzamin.com": "Daily Manab Zamin",
+})
+
+
 def detect_source_from_url(url):
-    patterns = {
-        "Daily Prothom Alo": r"prothomalo\.com",
-        "The Daily Star": r"thedailystar\.net",
-        "DW": r"dw\.com",
-        "The Business Standard": r"tbsnews\.net",
-        "Daily Manab Zamin": r"mzamin\.com",
-    }
-    for name, pattern in patterns.items():
-        if re.search(pattern, url or ""):
-            return name
-    return "Other"
+    return lookup_by_host(url, _HOST_TO_SOURCE) or "Other"
+
+
+# ---------------------------
+# Batch Fan-out
+# ---------------------------
+def _extract_one_url(url, target_classes_map):
+    source = detect_source_from_url(url)
+    if source not in target_classes_map:
+        return None, "❌ Source not recognized; batch mode only supports the predefined sources."
+    return extract_content_from_url(url, target_classes_map[source])
+
+
+def extract_many(urls, target_classes_map=_TARGET_CLASSES, max_workers=8):
+    # Fetches run concurrently over the shared pooled client; results come back in input order
+    get_http_client()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda url: _extract_one_url(url, target_classes_map), urls))
+
+
+def summarize_many(urls, api_key, min_limit, max_limit, max_workers=8):
+    # Pages are fetched concurrently, then the extracted articles are summarized a few per
+    # Gemini call; results come back in input order
+    extracted = extract_many(urls, max_workers=max_workers)
+    ready = [i for i, (content, error) in enumerate(extracted) if not error]
+    summaries = summarize_batch(
+        [extracted[i][0] for i in ready],
+        api_key,
+        min_limit,
+        max_limit,
+        [source_language(urls[i]) for i in ready],
+    )
+    results = [(None, error) for _, error in extracted]
+    for i, result in zip(ready, summaries):
+        results[i] = result
+    return results
 
 
 # ---------------------------
@@ -118,24 +586,16 @@ def url_page(api_key):
 
     detected_source = detect_source_from_url(url) if url else None
 
-    target_classes_map = {
-        "Daily Prothom Alo": ["story-element story-element-text"],
-        "The Daily Star": ["pb-20 clearfix"],
-        "DW": ["c17j8gzx rc0m0op r1ebneao s198y7xq rich-text li5mn0y r16w0xvi w1fzgn0z blt0baw"],
-        "The Business Standard": ["section-content clearfix margin-bottom-2", "section-content margin-bottom-2"],
-        "Daily Manab Zamin": ["col-sm-10 offset-sm-1 fs-5 lh-base mt-4 mb-5"],
-    }
-
     if detected_source and detected_source != "Other":
         source = detected_source
         st.info(f"Detected Source: **{source}**")
-        target_classes = target_classes_map.get(source, [])
+        target_classes = _TARGET_CLASSES.get(source, ())
         custom_class = ""
     else:
         source = "Other"
         st.info("Source not recognized. Please provide the CSS class for the article content.")
         custom_class = st.text_input("Enter CSS Class for Article Content:")
-        target_classes = [custom_class] if custom_class else []
+        target_classes = (frozenset(custom_class.split()),) if custom_class.strip() else ()
 
     min_limit, max_limit = st.slider(
         "Set Summary Length Range (words):",
@@ -146,50 +606,49 @@ def url_page(api_key):
         st.session_state.generated_url = False
 
     if not st.session_state.generated_url:
-        if st.button("🚀 Generate Summary", use_container_width=True):
+        # Held in a slot so a successful run can take the button down before drawing the summary UI
+        generate_slot = st.empty()
+        if generate_slot.button("🚀 Generate Summary", use_container_width=True):
             if url and target_classes and (source != "Other" or custom_class):
                 with st.spinner("Fetching and Summarizing..."):
                     content, error = extract_content_from_url(url, target_classes)
                     if error:
                         st.error(error)
                     elif content:
-                        summary, error = summarize_content(content, api_key, min_limit, max_limit)
+                        stream_slot = st.empty()
+                        summary, error = summarize_content(
+                            content, api_key, min_limit, max_limit, source_language(url), stream_to=stream_slot
+                        )
+                        stream_slot.empty()
                         if error:
                             st.error(error)
                         else:
-                            st.subheader("📑 Summary & Headline")
-                            st.success(summary)
-
                             st.session_state.generated_url = True
                             st.session_state.last_summary = summary
-                            st.rerun()
+                            generate_slot.empty()
                     else:
                         st.error("❌ Failed to extract content.")
             else:
                 st.warning("Please enter URL and CSS Class.")
-    else:
-        st.subheader("📑 Summary & Headline")
-        st.success(st.session_state.last_summary)
 
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("♻️ Regenerate Summary", use_container_width=True):
-                with st.spinner("Regenerating..."):
-                    content, error = extract_content_from_url(url, target_classes)
+    if st.session_state.generated_url:
+        summary_slot, regenerate = _render_summary_ui("url", st.session_state.last_summary)
+        if regenerate:
+            with st.spinner("Regenerating..."):
+                content, error = extract_content_from_url(url, target_classes)
+                if error:
+                    st.error(error)
+                elif content:
+                    summary, error = summarize_content(
+                        content, api_key, min_limit, max_limit, source_language(url), refresh=True
+                    )
                     if error:
                         st.error(error)
-                    elif content:
-                        summary, error = summarize_content(content, api_key, min_limit, max_limit)
-                        if error:
-                            st.error(error)
-                        else:
-                            st.session_state.last_summary = summary
-                            st.rerun()
                     else:
-                        st.error("❌ Failed to extract content.")
-        with col2:
-            if st.button("🏠 Home", use_container_width=True):
-                reset_output("url")
+                        st.session_state.last_summary = summary
+                        summary_slot.success(summary)
+                else:
+                    st.error("❌ Failed to extract content.")
 
 
 # ---------------------------
@@ -209,40 +668,98 @@ def text_page(api_key):
         st.session_state.generated_text = False
 
     if not st.session_state.generated_text:
-        if st.button("🚀 Generate Summary", use_container_width=True):
+        # Held in a slot so a successful run can take the button down before drawing the summary UI
+        generate_slot = st.empty()
+        if generate_slot.button("🚀 Generate Summary", use_container_width=True):
             if input_text.strip():
                 with st.spinner("Generating..."):
-                    summary, error = summarize_content(input_text.strip(), api_key, min_limit, max_limit)
+                    stream_slot = st.empty()
+                    summary, error = summarize_content(
+                        input_text.strip(), api_key, min_limit, max_limit, stream_to=stream_slot
+                    )
+                    stream_slot.empty()
                     if error:
                         st.error(error)
                     else:
-                        st.subheader("📑 Summary & Headline")
-                        st.success(summary)
-
                         st.session_state.generated_text = True
                         st.session_state.last_summary = summary
-                        st.rerun()
+                        generate_slot.empty()
             else:
                 st.warning("Please input some text.")
-    else:
-        st.subheader("📑 Summary & Headline")
-        st.success(st.session_state.last_summary)
 
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("♻️ Regenerate Summary", use_container_width=True):
-                with st.spinner("Regenerating..."):
-                    summary, error = summarize_content(
-                        input_text.strip(), api_key, min_limit, max_limit
-                    )
-                    if error:
-                        st.error(error)
-                    else:
-                        st.session_state.last_summary = summary
-                        st.rerun()
-        with col2:
-            if st.button("🏠 Home", use_container_width=True):
-                reset_output("text")
+    if st.session_state.generated_text:
+        summary_slot, regenerate = _render_summary_ui("text", st.session_state.last_summary)
+        if regenerate:
+            with st.spinner("Regenerating..."):
+                summary, error = summarize_content(
+                    input_text.strip(), api_key, min_limit, max_limit, refresh=True
+                )
+                if error:
+                    st.error(error)
+                else:
+                    st.session_state.last_summary = summary
+                    summary_slot.success(summary)
+
+
+# ---------------------------
+# Batch URL Summarizer (Page 3)
+# ---------------------------
+def batch_page(api_key):
+    st.title("📚 Batch URL Summarizer")
+
+    batch_input = st.text_area("Batch URLs (one per line):", height=200)
+    urls = [line.strip() for line in batch_input.splitlines() if line.strip()]
+
+    min_limit, max_limit = st.slider(
+        "Set Summary Length Range (words):",
+        50, 250, (70, 150)
+    )
+
+    if st.button("🚀 Generate Summaries", use_container_width=True):
+        if urls:
+            with st.spinner(f"Fetching and Summarizing {len(urls)} articles..."):
+                results = summarize_many(urls, api_key, min_limit, max_limit)
+            for url, (summary, error) in zip(urls, results):
+                st.subheader(f"📑 {url}")
+                if error:
+                    st.error(error)
+                else:
+                    st.success(summary)
+        else:
+            st.warning("Please enter at least one URL.")
+
+
+# ---------------------------
+# Sidebar Markup
+# ---------------------------
+# Static HTML built once at import rather than on every rerun
+_SIDEBAR_PROJECT_HTML = """
+    <div style='font-size: 14px; font-weight: normal;'>
+    Summarize from <strong>URL</strong> or <strong>custom text</strong> using predefined or user-defined sources.  
+    Built for <strong>speed, clarity, and insight</strong>.
+    </div>
+    """
+
+_SIDEBAR_AUTHOR_HTML = """
+    <div style='font-size: 14px; font-weight: normal;'>
+    Passionate about turning <strong>data into insights</strong> and building <strong>AI-powered tools</strong> for real-world impact.
+    </div>
+    """
+
+_SIDEBAR_LINKS_HTML = """
+    <div style='font-size: 14px; font-weight: normal;'>
+    <br>
+    <a href="https://www.linkedin.com/in/aanzum" target="_blank">
+        <img src="https://cdn-icons-png.flaticon.com/512/174/174857.png" alt="LinkedIn" width="16" style="vertical-align:middle; margin-right:6px;">
+        <strong>LinkedIn</strong>
+    </a>
+    &nbsp;&nbsp;
+    <a href="https://www.researchgate.net/profile/Tanvir-Anzum" target="_blank">
+        <img src="https://upload.wikimedia.org/wikipedia/commons/5/5e/ResearchGate_icon_SVG.svg" alt="ResearchGate" width="16" style="vertical-align:middle; margin-right:6px;">
+        <strong>Research</strong>
+    </a>
+    </div>
+    """
 
 
 # ---------------------------
@@ -258,44 +775,22 @@ def main():
         st.title("📰 InsightInMinutes")
         st.caption("⚡ AI-powered News Summarizer")
 
-        st.markdown("""
-            <div style='font-size: 14px; font-weight: normal;'>
-            Summarize from <strong>URL</strong> or <strong>custom text</strong> using predefined or user-defined sources.  
-            Built for <strong>speed, clarity, and insight</strong>.
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(_SIDEBAR_PROJECT_HTML, unsafe_allow_html=True)
 
         st.markdown("---")
 
         st.title("👨‍💻 About the Author")
         st.caption("Tanvir Anzum – AI & Data Researcher")
 
-        st.markdown("""
-            <div style='font-size: 14px; font-weight: normal;'>
-            Passionate about turning <strong>data into insights</strong> and building <strong>AI-powered tools</strong> for real-world impact.
-            </div>
-            """, unsafe_allow_html=True)
-
-        st.markdown("""
-            <div style='font-size: 14px; font-weight: normal;'>
-            <br>
-            <a href="https://www.linkedin.com/in/aanzum" target="_blank">
-                <img src="https://cdn-icons-png.flaticon.com/512/174/174857.png" alt="LinkedIn" width="16" style="vertical-align:middle; margin-right:6px;">
-                <strong>LinkedIn</strong>
-            </a>
-            &nbsp;&nbsp;
-            <a href="https://www.researchgate.net/profile/Tanvir-Anzum" target="_blank">
-                <img src="https://upload.wikimedia.org/wikipedia/commons/5/5e/ResearchGate_icon_SVG.svg" alt="ResearchGate" width="16" style="vertical-align:middle; margin-right:6px;">
-                <strong>Research</strong>
-            </a>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(_SIDEBAR_AUTHOR_HTML, unsafe_allow_html=True)
+
+        st.markdown(_SIDEBAR_LINKS_HTML, unsafe_allow_html=True)
 
         st.markdown("---")
 
         page = st.radio(            
             "Navigate to:",
-            ["🌐 URL Summarizer", "📝 Text Summarizer"]
+            ["🌐 URL Summarizer", "📝 Text Summarizer", "📚 Batch URLs"]
         )
 
     api_key, error_api = read_api_key()
@@ -305,8 +800,10 @@ def main():
 
     if page == "🌐 URL Summarizer":
         url_page(api_key)
-    else:
+    elif page == "📝 Text Summarizer":
         text_page(api_key)
+    else:
+        batch_page(api_key)
 
 
 # ---------------------------
@@ -1,11 +1,21 @@
 import streamlit as st  # type: ignore
-import pandas as pd  # type: ignore
-import requests
-from bs4 import BeautifulSoup
-from google import genai
-from google.genai import types
-import langdetect
+from lxml import html as lxml_html
+import html
 import re
+from core import (
+    MAX_BODY_BYTES,
+    MAX_PROMPT_CHARS,
+    SOURCE_PARAGRAPH_QUERIES,
+    class_paragraph_xpath,
+    get_client,
+    get_http_client,
+    has_min_words,
+    identify_language,
+    lookup_by_host,
+    parser_encoding,
+    read_api_key,
+    truncate_to_sentence,
+)
 
 # ---------------------------
 # ✅ Page Config (Must be First)
@@ -38,7 +48,10 @@ THEME = {
     "font_family": "'Inter', -apple-system, BlinkMacSystemFont, sans-serif"
 }
 
-st.markdown(f"""
+@st.cache_data(show_spinner=False)
+def theme_css_html():
+    # Formatted once per process; the script reruns on every interaction and would otherwise rebuild it each time
+    return f"""
 <style>
     /* Global Core Reset & Styling */
     html, body, [data-testid="stAppViewContainer"] {{
@@ -231,79 +244,85 @@ st.markdown(f"""
         font-weight: 600;
     }}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(theme_css_html(), unsafe_allow_html=True)
 
 # ---------------------------
-# API Key Loader
+# lxml Tree Helpers
 # ---------------------------
-def read_api_key():
-    try:
-        return st.secrets["genai"]["api_key"], None
-    except Exception:
-        return None, "API key missing in configuration files."
+def element_text(element):
+    return "".join(text.strip() for text in element.itertext())
 
 # ---------------------------
-# Universal Intelligent Link Engine
+# Capped Body Reader
 # ---------------------------
-def extract_universal_content(url, custom_class=None):
-    try:
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-        response = requests.get(url, headers=headers, timeout=12)
+def fetch_capped_body(url):
+    # Streams the response and stops downloading once the byte budget is reached; the raw bytes
+    # go to lxml with the header charset (if any), so no Python-side charset detection runs
+    chunks, received = [], 0
+    with get_http_client().stream("GET", url) as response:
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        if custom_class:
-            paragraphs = []
-            for div in soup.find_all(class_=custom_class):
-                paragraphs.extend([p.get_text(strip=True) for p in div.find_all('p')])
-            if paragraphs:
-                return "\n".join(paragraphs), None
-                
-        patterns = {
-            "prothomalo\\.com": ["story-element-text"],
-            "thedailystar\\.net": ["pb-20", "clearfix"],
-            "dw\\.com": ["rich-text"],
-            "tbsnews\\.net": ["section-content"],
-            "mzamin\\.com": ["lh-base"]
-        }
-        for pattern, classes in patterns.items():
-            if re.search(pattern, url):
-                paragraphs = []
-                for cls in classes:
-                    for div in soup.find_all(class_=cls):
-                        paragraphs.extend([p.get_text(strip=True) for p in div.find_all('p')])
-                if paragraphs:
-                    return "\n".join(paragraphs), None
+        for chunk in response.iter_bytes(chunk_size=65536):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= MAX_BODY_BYTES:
+                break
+    return b"".join(chunks), parser_encoding(response.charset_encoding)
 
-        for element in soup(["nav", "footer", "header", "script", "style", "aside", "form"]):
-            element.decompose()
-            
-        paragraphs = [p.get_text(strip=True) for p in soup.find_all('p') if len(p.get_text(strip=True).split()) > 8]
-        combined = "\n".join(paragraphs)
+# ---------------------------
+# Universal Intelligent Link Engine
+# ---------------------------
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def scrape_article_text(url, custom_class=None):
+    # Memoized on (url, custom_class): re-running with new word limits reuses the page instead of
+    # refetching it. Failures raise rather than return, so they are never cached.
+    body, encoding = fetch_capped_body(url)
+
+    queries = [class_paragraph_xpath([custom_class])] if custom_class else []
+    source_query = lookup_by_host(url, SOURCE_PARAGRAPH_QUERIES)
+    if source_query is not None:
+        queries.append(source_query)
+
+    parser = lxml_html.HTMLParser(encoding=encoding) if encoding else None
+    doc = lxml_html.document_fromstring(body, parser=parser)
+    for query in queries:
+        paragraphs = [element_text(p) for p in query(doc)]
+        if paragraphs:
+            return "\n".join(paragraphs)
+
+    for element in list(doc.iter("nav", "footer", "header", "script", "style", "aside", "form")):
+        element.drop_tree()
         
-        if len(combined.split()) < 40:
-            combined = soup.get_text(separator="\n", strip=True)
-            
-        return combined, None
+    paragraphs = [text for text in (element_text(p) for p in doc.iter('p')) if has_min_words(text, 9)]
+    combined = "\n".join(paragraphs)
+    
+    if not has_min_words(combined, 40):
+        combined = "\n".join(text.strip() for text in doc.itertext() if text.strip())
+        
+    return combined
+
+def extract_universal_content(url, custom_class=None):
+    try:
+        return scrape_article_text(url, custom_class), None
     except Exception as e:
         return None, f"Scraping Failure: {str(e)}"
 
 # ---------------------------
 # Resilient Cascade Fallback Inference Core
 # ---------------------------
-def execute_summary(content, api_key, min_limit, max_limit):
-    try:
-        detected_lang = langdetect.detect(content)
-    except Exception:
-        detected_lang = "en"
+def execute_summary(content, api_key, min_limit, max_limit, stream_to=None):
+    from google.genai import types
+
+    detected_lang = identify_language(content)
         
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
     
     prompt = (
         f"Summarize the following text in the {detected_lang} language. "
         f"Keep the response strictly short and dense between {min_limit} and {max_limit} words. "
         f"Format explicitly with 'HEADLINE:' on line 1, followed by 'SUMMARY:' on line 2.\n\n"
-        f"Text:\n{content}"
+        f"Text:\n{truncate_to_sentence(content, MAX_PROMPT_CHARS)}"
     )
 
     # All possible free-tier models included in order of architectural preference
@@ -326,14 +345,21 @@ def execute_summary(content, api_key, min_limit, max_limit):
                 tools=[types.Tool(googleSearch=types.GoogleSearch())]
             )
                 
-            response = client.models.generate_content(
+            # Streamed so the caller's placeholder fills in while the model is still writing;
+            # a model that fails mid-stream just hands the placeholder to the next one
+            chunks = []
+            for chunk in client.models.generate_content_stream(
                 model=current_model,
                 contents=prompt,
                 config=generate_config
-            )
+            ):
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    if stream_to is not None:
+                        stream_to.markdown("".join(chunks))
             
-            if response and response.text:
-                raw_text = response.text.strip()
+            if chunks and "".join(chunks).strip():
+                raw_text = "".join(chunks).strip()
                 headline = "Insights Update"
                 summary_body = raw_text
                 
@@ -356,6 +382,8 @@ def execute_summary(content, api_key, min_limit, max_limit):
                 return headline, summary_body, current_model, None
                 
         except Exception as e:
+            if stream_to is not None:
+                stream_to.empty()
             err_msg = str(e)
             if "429" in err_msg or "RESOURCE_EXHAUSTED" in err_msg:
                 match = re.search(r"retry in ([\d\.]+)s", err_msg)
@@ -375,70 +403,68 @@ def execute_summary(content, api_key, min_limit, max_limit):
 # ---------------------------
 def render_output_dashboard(model_used=None):
     if st.session_state.last_summary:
-        st.markdown('<div class="full-width-wrapper">', unsafe_allow_html=True)
+        # One markdown element for both cards; model output is escaped so stray markup in it renders as text
         st.markdown(f"""
+        <div class="full-width-wrapper">
         <div class="headline-card-premium">
             <span class="badge-headline">Generated Flash Headline</span>
-            <h2 style="text-align:left; margin:0; font-size:23px; color:#FFFFFF;">{st.session_state.headline}</h2>
+            <h2 style="text-align:left; margin:0; font-size:23px; color:#FFFFFF;">{html.escape(st.session_state.headline or "")}</h2>
         </div>
         <div class="summary-card-premium">
             <span class="badge-summary">Analytical Synthesis Summary</span>
-            <p style="margin-top:4px; margin-bottom:0; line-height:1.7; font-size:14.5px; color:{THEME['text_color']};">{st.session_state.last_summary}</p>
+            <p style="margin-top:4px; margin-bottom:0; line-height:1.7; font-size:14.5px; color:{THEME['text_color']};">{html.escape(st.session_state.last_summary)}</p>
+        </div>
         </div>
         """, unsafe_allow_html=True)
         
         if model_used:
             st.caption(f"⚡ Engine Allocation Telemetry: Processed via free cluster `{model_used}` node.")
-        st.markdown('</div>', unsafe_allow_html=True)
 
 # ---------------------------
-# Main Shell Framework
+# Token Telemetry Panel
 # ---------------------------
-def main():
-    api_key, api_err = read_api_key()
+def render_token_panel(slot):
+    # Drawn into a sidebar placeholder so a finished generation can refresh it without st.rerun()
+    total_volume = st.session_state.token_metrics["total"]
+    input_pct = (st.session_state.token_metrics["input"] / total_volume * 100) if total_volume > 0 else 0
+    output_pct = (st.session_state.token_metrics["output"] / total_volume * 100) if total_volume > 0 else 0
     
-    with st.sidebar:
-        # 🏛️ Revamped Brand HUD Layout
-        st.markdown("""
+    slot.markdown(f"""
+    <div class="token-container">
+        <div class="progress-bar-wrapper">
+            <div class="progress-bar-label">
+                <span>Telemetry Allocation Mix</span>
+            </div>
+            <div class="progress-legend">
+                <div class="legend-item"><span style="color:#EF4444;">●</span> In ({st.session_state.token_metrics["input"]})</div>
+                <div class="legend-item"><span style="color:{THEME['summary_accent']};">●</span> Out ({st.session_state.token_metrics["output"]})</div>
+            </div>
+            <div class="progress-track-segmented">
+                <div class="segment-input" style="width: {input_pct}%;"></div>
+                <div class="segment-output" style="width: {output_pct}%;"></div>
+            </div>
+        </div>
+        <div class="token-row-total">
+            <span>Total Billed Volume</span>
+            <span>{total_volume}</span>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+# ---------------------------
+# Static Sidebar Markup
+# ---------------------------
+BRAND_HUD_HTML = """
         <div class="brand-hud-card">
             <h2 class="brand-hud-title">🔎 InsightInMinutes</h2>
             <div class="brand-hud-tag">1Minute  AI News Reader</div>
         </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        st.markdown("### 📊 Active Token Counters")
-        
-        total_volume = st.session_state.token_metrics["total"]
-        input_pct = (st.session_state.token_metrics["input"] / total_volume * 100) if total_volume > 0 else 0
-        output_pct = (st.session_state.token_metrics["output"] / total_volume * 100) if total_volume > 0 else 0
-        
-        st.markdown(f"""
-        <div class="token-container">
-            <div class="progress-bar-wrapper">
-                <div class="progress-bar-label">
-                    <span>Telemetry Allocation Mix</span>
-                </div>
-                <div class="progress-legend">
-                    <div class="legend-item"><span style="color:#EF4444;">●</span> In ({st.session_state.token_metrics["input"]})</div>
-                    <div class="legend-item"><span style="color:{THEME['summary_accent']};">●</span> Out ({st.session_state.token_metrics["output"]})</div>
-                </div>
-                <div class="progress-track-segmented">
-                    <div class="segment-input" style="width: {input_pct}%;"></div>
-                    <div class="segment-output" style="width: {output_pct}%;"></div>
-                </div>
-            </div>
-            <div class="token-row-total">
-                <span>Total Billed Volume</span>
-                <span>{total_volume}</span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # 📚 Fixed Editorial Author Module using valid THEME keys mapping
-        st.markdown(f"""
+        """
+
+@st.cache_data(show_spinner=False)
+def author_card_html():
+    # Built once per process instead of re-formatting the THEME f-string on every rerun
+    return f"""
             <div style="background: {THEME['card_bg']}; border: 1px solid {THEME['card_border']}; border-radius: 12px; padding: 16px; box-shadow: 0 4px 15px rgba(0,0,0,0.2);">
                 <div class="info-label" style="margin-bottom: 2px;">Project Architect</div>
                 <div style="font-size: 16px; font-weight: 700; color: #FFFFFF; margin-bottom: 8px;">Tanvir Anzum</div>
@@ -459,7 +485,28 @@ def main():
                     </a>
                 </div>
             </div>
-        """, unsafe_allow_html=True)
+        """
+
+# ---------------------------
+# Main Shell Framework
+# ---------------------------
+def main():
+    api_key, api_err = read_api_key()
+    
+    with st.sidebar:
+        # 🏛️ Revamped Brand HUD Layout
+        st.markdown(BRAND_HUD_HTML, unsafe_allow_html=True)
+        
+        st.markdown("---")
+        st.markdown("### 📊 Active Token Counters")
+        
+        token_slot = st.empty()
+        render_token_panel(token_slot)
+        
+        st.markdown("---")
+        
+        # 📚 Fixed Editorial Author Module using valid THEME keys mapping
+        st.markdown(author_card_html(), unsafe_allow_html=True)
         
         st.markdown("---")
 
@@ -507,7 +554,9 @@ def main():
                         if scrap_err:
                             st.error(scrap_err)
                         elif content:
-                            hd, sm, active_model, ai_err = execute_summary(content, api_key, min_limit, max_limit)
+                            live_output = st.empty()
+                            hd, sm, active_model, ai_err = execute_summary(content, api_key, min_limit, max_limit, stream_to=live_output)
+                            live_output.empty()
                             if ai_err:
                                 st.error(ai_err)
                             else:
@@ -515,7 +564,7 @@ def main():
                                 st.session_state.last_summary = sm
                                 st.session_state.model_used = active_model
                                 st.session_state.cache_vault[cache_key] = {"headline": hd, "summary": sm, "model": active_model}
-                                st.rerun()
+                                render_token_panel(token_slot)
             else:
                 st.warning("Please specify an active article link pointer.")
 
@@ -550,7 +599,9 @@ def main():
                     st.session_state.model_used = cached_data["model"] + " (Cached Memory)"
                 else:
                     with st.spinner("Processing sequence matrix inputs..."):
-                        hd, sm, active_model, ai_err = execute_summary(raw_text.strip(), api_key, min_limit, max_limit)
+                        live_output = st.empty()
+                        hd, sm, active_model, ai_err = execute_summary(raw_text.strip(), api_key, min_limit, max_limit, stream_to=live_output)
+                        live_output.empty()
                         if ai_err:
                             st.error(ai_err)
                         else:
@@ -558,7 +609,7 @@ def main():
                             st.session_state.last_summary = sm
                             st.session_state.model_used = active_model
                             st.session_state.cache_vault[cache_key] = {"headline": hd, "summary": sm, "model": active_model}
-                            st.rerun()
+                            render_token_panel(token_slot)
             else:
                 st.warning("Please supply valid inputs into character map buffers.")
 